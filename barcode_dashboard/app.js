@@ -91,7 +91,7 @@ function applySearch() {
 }
 
 async function boot() {
-  const response = await fetch("/api/barcode/records", { cache: "no-store" });
+  const response = await fetch("/api/barcode/records", { cache: "no-cache" });
   if (!response.ok) {
     throw new Error(`Failed to load barcode data (${response.status})`);
   }
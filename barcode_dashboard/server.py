@@ -4,21 +4,39 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import hmac
 import json
 import os
+import queue
 import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
-from urllib.parse import parse_qs, urlparse
+from typing import Any, BinaryIO, Iterable, Iterator
+from urllib.parse import parse_qs, unquote_plus
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
 
 
 ROOT = Path(__file__).resolve().parent.parent
 BOOTSTRAP_CSV = Path(os.getenv("ZB_BOOTSTRAP_CSV", str(ROOT / "BARCODEDELIVERYTRACKING_Report.csv")))
 EVENTS_FILE = ROOT / "barcode_dashboard" / "live_events.jsonl"
+# Large sequential reads: fewer read() syscalls than the 8 KB default.
+READ_BUFFER_SIZE = 1 << 20
+# Most queued writes (one per webhook request) one fsync may cover.
+WRITE_BATCH_MAX = 64
+WRITE_BUFFER_SIZE = 1 << 16
+# Most field text held in handed-off parse results for lines not yet read back;
+# see append_live_events().
+PARSED_BYTES_MAX = 1 << 22
 
 
 def _split_csv_env(name: str, default: str) -> list[str]:
@@ -34,6 +52,7 @@ CFG = {
     "host": os.getenv("DASHBOARD_HOST", "0.0.0.0"),
     "port": int(os.getenv("PORT", os.getenv("DASHBOARD_PORT", "8000"))),
     "webhook_secret": os.getenv("ZB_WEBHOOK_SECRET", "").strip(),
+    "max_body": int(os.getenv("ZB_MAX_BODY", "1048576")),
     "order_keys": _split_csv_env(
         "ZB_ORDER_KEYS", "ORDER, PICK OR PO. NUMBER|Order|Pick|PO Number|INFORMATION|Information"
     ),
@@ -42,50 +61,177 @@ CFG = {
     "added_time_keys": _split_csv_env("ZB_ADDED_TIME_KEYS", "Added Time,added_time,Submitted Time"),
 }
 
+# Lowercased (and de-duplicated) *_keys lists for case-insensitive lookups.
+CFG_LOWER = {
+    name: list(dict.fromkeys(k.lower() for k in keys)) for name, keys in CFG.items() if name.endswith("_keys")
+}
+# Every payload field name any *_keys lookup can ask for.
+_WANTED_KEYS = frozenset(k for keys in CFG_LOWER.values() for k in keys)
+# *_keys lookups made for every payload, in the order _payload_fields() returns them.
+_PAYLOAD_FIELDS = ("order_keys", "dropped_by_keys", "datetime_keys", "added_time_keys")
+# Most distinct flat-payload key layouts remembered by _flat_plan(). Only layouts
+# of at most FLAT_PLAN_MAX_KEYS keys, FLAT_PLAN_MAX_KEY_CHARS characters in all, are
+# remembered, so the cache stays small however large the payloads are.
+FLAT_PLANS_MAX = 256
+FLAT_PLAN_MAX_KEYS = 64
+FLAT_PLAN_MAX_KEY_CHARS = 4096
+
 LOCK = threading.Lock()
 
+# ((st_mtime_ns, st_size), entries) for BOOTSTRAP_CSV; guarded by LOCK.
+_BOOTSTRAP_CACHE: tuple[tuple[int, int], tuple[Entry, ...]] | None = None
+
+# Live events parsed so far and the EVENTS_FILE byte offset consumed; guarded by LOCK.
+_LIVE_OFFSET = 0
+_LIVE_ENTRIES: list[Entry] = []
+_LAST_RECEIVED_AT = ""
+# Journal inode, and a counter bumped whenever the journal is truncated or
+# replaced and the live state above is rebuilt from scratch.
+_LIVE_INODE = 0
+_LIVE_GENERATION = 0
+
+# Serialized /api/barcode/records body keyed on (bootstrap signature, _LIVE_GENERATION,
+# _LIVE_OFFSET), with its ETag; guarded by LOCK.
+_RECORDS_JSON: tuple[tuple[tuple[int, int] | None, int, int], bytes, str] | None = None
+
+# Journal lines waiting for the background writer; see append_live_events().
+_WRITE_Q: queue.SimpleQueue[_PendingWrite] = queue.SimpleQueue()
+_WRITER: threading.Thread | None = None
+_WRITER_LOCK = threading.Lock()
+# Append handle kept open across batches; only the writer thread touches it.
+_EVENTS_FH: BinaryIO | None = None
+# Journal lines written by this process, keyed by _line_key() and mapped to
+# (received_at, parsed payload, _parsed_size()), so _sync_live_events can skip
+# decoding them again. _PARSED_BYTES totals the sizes; both guarded by _PARSED_LOCK.
+_PARSED_LINES: dict[bytes, tuple[str, list[Entry], int]] = {}
+_PARSED_BYTES = 0
+_PARSED_LOCK = threading.Lock()
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_line(obj: Any) -> bytes:
+    # One newline-terminated JSONL record; orjson appends the newline itself.
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj).encode("utf-8") + b"\n"
+
+
+def _advise_sequential(f: Any, offset: int = 0) -> None:
+    # Where supported (Linux), start kernel readahead for the rest of the file so
+    # cold-cache reads overlap with parsing instead of stalling on each refill.
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(f.fileno(), offset, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(f.fileno(), offset, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
 
-@dataclass
+@dataclass(slots=True)
 class Entry:
     order_value: str
     dropped_off_by: str
     date_time: str
     added_time: str
-    raw: dict[str, Any]
-
-
-def flatten(data: Any, prefix: str = "", out: dict[str, str] | None = None) -> dict[str, str]:
-    if out is None:
-        out = {}
-    if isinstance(data, dict):
-        for key, value in data.items():
-            key_s = str(key)
-            p = f"{prefix}.{key_s}" if prefix else key_s
-            flatten(value, p, out)
-            if not isinstance(value, (dict, list)):
-                out[key_s] = str(value)
-    elif isinstance(data, list):
-        for idx, value in enumerate(data):
-            p = f"{prefix}[{idx}]"
-            flatten(value, p, out)
-    else:
-        out[prefix] = str(data)
-    return out
 
 
-def first_value(flat: dict[str, str], keys: list[str]) -> str:
-    lowered = {k.lower(): v for k, v in flat.items()}
+def _extract_wanted(payload: Any) -> dict[str, str]:
+    # Depth-first walk keeping only scalar leaves whose lowercased key is in
+    # _WANTED_KEYS; everything else is dropped without building strings for it.
+    # Leaves are keyed by exact name first (later duplicates win), then folded to
+    # lowercase, so keys differing only in case resolve as a full flatten would.
+    exact: dict[str, tuple[str, str]] = {}
+    stack: list[tuple[str, Any]] = [("", payload)]
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, dict):
+            children = []
+            for child_key, child in value.items():
+                if isinstance(child, (dict, list)):
+                    children.append(("", child))
+                else:
+                    child_key = str(child_key)
+                    if child_key.lower() in _WANTED_KEYS:
+                        children.append((child_key, child))
+            children.reverse()
+            stack.extend(children)
+        elif isinstance(value, list):
+            # Scalars directly inside a list have no key to match; skip them here.
+            stack.extend(("", child) for child in reversed(value) if isinstance(child, (dict, list)))
+        elif key:
+            exact[key] = (key.lower(), str(value).strip())
+    return dict(exact.values())
+
+
+def first_value(lowered: dict[str, str], keys: list[str]) -> str:
+    # `lowered` is an _extract_wanted() result (lowercased keys, stripped values),
+    # built once per payload; `keys` is a CFG_LOWER list.
     for key in keys:
-        value = lowered.get(key.lower())
-        if value is not None and str(value).strip():
-            return str(value).strip()
+        value = lowered.get(key)
+        if value:
+            return value
     return ""
 
 
+_FLAT_PLANS: dict[tuple[Any, ...], tuple[tuple[Any, ...], ...]] = {}
+
+
+def _flat_plan(keys: tuple[Any, ...]) -> tuple[tuple[Any, ...], ...]:
+    # For a flat payload with these keys (in order), the payload keys that can
+    # answer each _PAYLOAD_FIELDS lookup, in lookup order. Mirrors _extract_wanted():
+    # among keys equal up to case, the last one wins.
+    plan = _FLAT_PLANS.get(keys)
+    if plan is None:
+        last: dict[str, Any] = {}
+        for key in keys:
+            lowered = str(key).lower()
+            if lowered in _WANTED_KEYS:
+                last[lowered] = key
+        plan = tuple(tuple(last[k] for k in CFG_LOWER[name] if k in last) for name in _PAYLOAD_FIELDS)
+        if len(_FLAT_PLANS) < FLAT_PLANS_MAX and sum(len(str(k)) for k in keys) <= FLAT_PLAN_MAX_KEY_CHARS:
+            _FLAT_PLANS[keys] = plan
+    return plan
+
+
+def _payload_fields(payload: Any) -> list[str]:
+    # first_value() of each _PAYLOAD_FIELDS lookup. Webhooks from one form send the
+    # same flat layout every time, so those are answered from a cached per-layout
+    # plan with a few direct lookups; nested or very wide payloads take the full walk.
+    if (
+        isinstance(payload, dict)
+        and len(payload) <= FLAT_PLAN_MAX_KEYS
+        and not any(isinstance(v, (dict, list)) for v in payload.values())
+    ):
+        out = []
+        for candidates in _flat_plan(tuple(payload)):
+            value = ""
+            for key in candidates:
+                value = str(payload[key]).strip()
+                if value:
+                    break
+            out.append(value)
+        return out
+    lowered = _extract_wanted(payload)
+    return [first_value(lowered, CFG_LOWER[name]) for name in _PAYLOAD_FIELDS]
+
+
 def _find_column_index(header: list[str], keys: list[str]) -> int:
+    # `keys` must already be lowercase (see CFG_LOWER).
     lookup = {c.strip().lower(): i for i, c in enumerate(header) if c.strip()}
     for key in keys:
-        idx = lookup.get(key.lower())
+        idx = lookup.get(key)
         if idx is not None:
             return idx
     return -1
@@ -107,85 +253,82 @@ def _split_order_values(raw: str) -> list[str]:
     return items
 
 
-def load_bootstrap_entries() -> list[Entry]:
-    if not BOOTSTRAP_CSV.exists():
-        return []
+def _read_bootstrap_entries() -> list[Entry]:
+    with BOOTSTRAP_CSV.open(newline="", encoding="utf-8", buffering=READ_BUFFER_SIZE) as f:
+        _advise_sequential(f)
+        return _parse_bootstrap_rows(csv.reader(f))
 
-    with BOOTSTRAP_CSV.open(newline="", encoding="utf-8") as f:
-        rows = list(csv.reader(f))
 
-    if not rows:
+def _parse_bootstrap_rows(reader: Iterator[list[str]]) -> list[Entry]:
+    # Rows are consumed as the reader yields them; the file is never held as a list.
+    first = next(reader, None)
+    if first is None:
         return []
+    second = next(reader, None)
 
-    header_row = [c.strip() for c in rows[0]]
-    second_row = [c.strip() for c in rows[1]] if len(rows) > 1 else []
+    header_row = [c.strip() for c in first]
+    second_row = [c.strip() for c in second] if second is not None else []
 
-    order_idx = _find_column_index(second_row, CFG["order_keys"])
-    date_time_idx = _find_column_index(header_row, CFG["datetime_keys"])
-    dropped_by_idx = _find_column_index(header_row, CFG["dropped_by_keys"])
-    added_time_idx = _find_column_index(header_row, CFG["added_time_keys"])
+    order_idx = _find_column_index(second_row, CFG_LOWER["order_keys"])
+    date_time_idx = _find_column_index(header_row, CFG_LOWER["datetime_keys"])
+    dropped_by_idx = _find_column_index(header_row, CFG_LOWER["dropped_by_keys"])
+    added_time_idx = _find_column_index(header_row, CFG_LOWER["added_time_keys"])
 
     data_start = 2 if second_row else 1
 
     entries: list[Entry] = []
-    previous_order = ""
-    previous_dropped_by = ""
-    previous_date_time = ""
-    previous_added_time = ""
+    # Business rule: blank columns inherit from previous row. Each value carries
+    # over between iterations, so `cell or value` is the forward fill.
+    order_items: list[str] = []
+    dropped_by = date_time = added_time = ""
+
+    data_rows: Iterable[list[str]] = reader
+    if data_start == 1 and second is not None:
+        data_rows = chain([second], reader)
 
-    for row in rows[data_start:]:
-        if not any(c.strip() for c in row):
+    for row in data_rows:
+        if not "".join(row).strip():
             continue
 
         order_value = _cell(row, order_idx)
-        dropped_by = _cell(row, dropped_by_idx)
-        date_time = _cell(row, date_time_idx)
-        added_time = _cell(row, added_time_idx)
-
-        # Business rule: blank columns inherit from previous row.
-        if not order_value:
-            order_value = previous_order
-        if not dropped_by:
-            dropped_by = previous_dropped_by
-        if not date_time:
-            date_time = previous_date_time
-        if not added_time:
-            added_time = previous_added_time
-
         if order_value:
-            previous_order = order_value
-        if dropped_by:
-            previous_dropped_by = dropped_by
-        if date_time:
-            previous_date_time = date_time
-        if added_time:
-            previous_added_time = added_time
-
-        for item in _split_order_values(order_value):
+            # Inherited orders reuse the previous split instead of re-splitting.
+            order_items = _split_order_values(order_value)
+        dropped_by = _cell(row, dropped_by_idx) or dropped_by
+        date_time = _cell(row, date_time_idx) or date_time
+        added_time = _cell(row, added_time_idx) or added_time
+
+        for item in order_items:
             entries.append(
                 Entry(
                     order_value=item,
                     dropped_off_by=dropped_by,
                     date_time=date_time,
                     added_time=added_time,
-                    raw={
-                        "order_value": item,
-                        "dropped_off_by": dropped_by,
-                        "date_time": date_time,
-                        "added_time": added_time,
-                    },
                 )
             )
 
     return entries
 
 
+def _bootstrap_snapshot() -> tuple[tuple[int, int] | None, tuple[Entry, ...]]:
+    # Re-parse the CSV only when it changes on disk. Callers hold LOCK.
+    global _BOOTSTRAP_CACHE
+    try:
+        st = os.stat(BOOTSTRAP_CSV)
+    except FileNotFoundError:
+        _BOOTSTRAP_CACHE = None
+        return None, ()
+
+    sig = (st.st_mtime_ns, st.st_size)
+    if _BOOTSTRAP_CACHE is None or _BOOTSTRAP_CACHE[0] != sig:
+        # Stored as a tuple so nothing holding the snapshot can mutate the cache.
+        _BOOTSTRAP_CACHE = (sig, tuple(_read_bootstrap_entries()))
+    return _BOOTSTRAP_CACHE
+
+
 def parse_live_entries_from_payload(payload: dict[str, Any]) -> list[Entry]:
-    flat = flatten(payload)
-    order_raw = first_value(flat, CFG["order_keys"])
-    dropped_by = first_value(flat, CFG["dropped_by_keys"])
-    date_time = first_value(flat, CFG["datetime_keys"])
-    added_time = first_value(flat, CFG["added_time_keys"])
+    order_raw, dropped_by, date_time, added_time = _payload_fields(payload)
 
     entries: list[Entry] = []
     for item in _split_order_values(order_raw):
@@ -195,61 +338,266 @@ def parse_live_entries_from_payload(payload: dict[str, Any]) -> list[Entry]:
                 dropped_off_by=dropped_by,
                 date_time=date_time,
                 added_time=added_time,
-                raw=payload,
             )
         )
     return entries
 
 
-def load_live_entries() -> list[Entry]:
-    if not EVENTS_FILE.exists():
-        return []
-
-    entries: list[Entry] = []
-    with EVENTS_FILE.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            item = json.loads(line)
-            payload = item.get("payload", {})
-            entries.extend(parse_live_entries_from_payload(payload))
-    return entries
+def _reset_live() -> None:
+    # Forget everything read from the journal so the next sync starts at byte 0.
+    # Bumping the generation makes anything derived from it rebuild. Callers hold LOCK.
+    global _LIVE_OFFSET, _LIVE_ENTRIES, _LAST_RECEIVED_AT, _LIVE_GENERATION
+    _LIVE_ENTRIES = []
+    _LAST_RECEIVED_AT = ""
+    _forget_parsed()
+    _LIVE_OFFSET = 0
+    _LIVE_GENERATION += 1
 
 
-def append_live_event(payload: dict[str, Any]) -> None:
+def _sync_live_events() -> None:
+    # Parse only lines appended since the last call. Callers hold LOCK.
+    global _LIVE_OFFSET, _LAST_RECEIVED_AT, _LIVE_INODE
+    try:
+        st = os.stat(EVENTS_FILE)
+    except FileNotFoundError:
+        size, inode = 0, _LIVE_INODE
+    else:
+        size, inode = st.st_size, st.st_ino
+
+    if size < _LIVE_OFFSET or (inode != _LIVE_INODE and _LIVE_OFFSET):
+        # Truncated, removed or replaced: what we parsed no longer matches the file.
+        _reset_live()
+    _LIVE_INODE = inode
+    if size == _LIVE_OFFSET:
+        return
+
+    with EVENTS_FILE.open("rb", buffering=READ_BUFFER_SIZE) as f:
+        _advise_sequential(f, _LIVE_OFFSET)
+        f.seek(_LIVE_OFFSET)
+        for line in f:
+            # A line without its newline is still being written; read it next time.
+            if not line.endswith(b"\n"):
+                break
+            known = _take_parsed(_line_key(line)) if _PARSED_LINES else None
+            if known is not None:
+                _LAST_RECEIVED_AT, entries = known
+                _LIVE_ENTRIES.extend(entries)
+            elif not line.isspace():
+                item = _json_loads(line)
+                _LIVE_ENTRIES.extend(parse_live_entries_from_payload(item.get("payload", {})))
+                _LAST_RECEIVED_AT = str(item.get("received_at") or "")
+            _LIVE_OFFSET += len(line)
+
+
+def _line_key(line: bytes) -> bytes:
+    # Fixed-size stand-in for a journal line in _PARSED_LINES.
+    return hashlib.blake2b(line, digest_size=16).digest()
+
+
+def _parsed_size(entries: list[Entry]) -> int:
+    # Field text a handed-off parse result holds, for the PARSED_BYTES_MAX cap.
+    return sum(len(e.order_value) + len(e.dropped_off_by) + len(e.date_time) + len(e.added_time) for e in entries)
+
+
+def _hand_off(lines: list[bytes], received_at: str, parsed: list[list[Entry]]) -> list[bytes]:
+    # Remember each line's parse result until it is read back, while the total stays
+    # within PARSED_BYTES_MAX; past that, lines are simply decoded again. Returns the
+    # keys actually stored.
+    global _PARSED_BYTES
+    keys = []
+    with _PARSED_LOCK:
+        for line, result in zip(lines, parsed):
+            key = _line_key(line)
+            size = _parsed_size(result)
+            if _PARSED_BYTES + size > PARSED_BYTES_MAX:
+                break
+            if key not in _PARSED_LINES:
+                _PARSED_LINES[key] = (received_at, result, size)
+                _PARSED_BYTES += size
+                keys.append(key)
+    return keys
+
+
+def _take_parsed(key: bytes) -> tuple[str, list[Entry]] | None:
+    global _PARSED_BYTES
+    with _PARSED_LOCK:
+        known = _PARSED_LINES.pop(key, None)
+        if known is None:
+            return None
+        _PARSED_BYTES -= known[2]
+    return known[0], known[1]
+
+
+def _forget_parsed(keys: list[bytes] | None = None) -> None:
+    # Drop the given handed-off results, or all of them.
+    global _PARSED_BYTES
+    with _PARSED_LOCK:
+        if keys is None:
+            _PARSED_LINES.clear()
+            _PARSED_BYTES = 0
+            return
+        for key in keys:
+            known = _PARSED_LINES.pop(key, None)
+            if known is not None:
+                _PARSED_BYTES -= known[2]
+
+
+class _PendingWrite:
+    # One or more complete journal lines, written together. `keys` are the
+    # _PARSED_LINES entries handed off for them, dropped again if the write fails.
+    __slots__ = ("data", "keys", "done", "error")
+
+    def __init__(self, data: bytes, keys: list[bytes] | None = None) -> None:
+        self.data = data
+        self.keys = keys
+        self.done = threading.Event()
+        self.error: OSError | None = None
+
+
+def _events_handle() -> BinaryIO:
+    # Reuse the open journal handle unless the file was removed or replaced
+    # underneath it, in which case appends would land in an orphaned inode.
+    global _EVENTS_FH
+    fh = _EVENTS_FH
+    if fh is not None:
+        try:
+            if os.stat(EVENTS_FILE).st_ino == os.fstat(fh.fileno()).st_ino:
+                return fh
+        except FileNotFoundError:
+            pass
+        _close_events_handle()
     EVENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    event = {"received_at": datetime.now(timezone.utc).isoformat(), "payload": payload}
-    with EVENTS_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    _EVENTS_FH = EVENTS_FILE.open("ab", buffering=WRITE_BUFFER_SIZE)
+    return _EVENTS_FH
 
 
-def last_live_event_received_at() -> str:
-    if not EVENTS_FILE.exists():
-        return ""
+def _close_events_handle() -> None:
+    global _EVENTS_FH
+    fh, _EVENTS_FH = _EVENTS_FH, None
+    if fh is not None:
+        try:
+            fh.close()
+        except OSError:
+            pass
+
+
+def _event_writer() -> None:
+    # Group commit: take whatever queued up while the previous fsync ran and make it
+    # durable with one write + fsync, then release every waiting request.
+    while True:
+        batch = [_WRITE_Q.get()]
+        while len(batch) < WRITE_BATCH_MAX:
+            try:
+                batch.append(_WRITE_Q.get_nowait())
+            except queue.Empty:
+                break
+
+        error = None
+        try:
+            f = _events_handle()
+            f.writelines(p.data for p in batch)
+            f.flush()
+            os.fsync(f.fileno())
+        except OSError as exc:
+            # Start the next batch from a fresh handle rather than one whose
+            # buffer may still hold part of this batch.
+            _close_events_handle()
+            error = exc
+        for p in batch:
+            if error is not None and p.keys:
+                _forget_parsed(p.keys)
+            p.error = error
+            p.done.set()
+
+
+def _ensure_writer() -> None:
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = threading.Thread(target=_event_writer, name="live-events-writer", daemon=True)
+            _WRITER.start()
+
+
+def append_live_events(payloads: list[dict[str, Any]], entries: list[list[Entry]] | None = None) -> None:
+    # Journal one line per payload as a single queued write, so a batch shares one
+    # fsync and one wait. Returns once every line is on disk. Call without LOCK so
+    # concurrent webhooks can share a batch. `entries`, if given, holds
+    # parse_live_entries_from_payload() of each payload; those results are reused when the lines are
+    # read back instead of decoding them again.
+    if not payloads:
+        return
+    received_at = datetime.now(timezone.utc).isoformat()
+    lines = [_json_line({"received_at": received_at, "payload": payload}) for payload in payloads]
+    keys = _hand_off(lines, received_at, entries) if entries is not None else None
+    pending = _PendingWrite(b"".join(lines), keys)
+    _ensure_writer()
+    _WRITE_Q.put(pending)
+    pending.done.wait()
+    if pending.error is not None:
+        raise pending.error
+
+
+def split_batch(payload: dict[str, Any]) -> list[dict[str, Any]] | None:
+    # The events of a batched POST: {"items": [{...}, ...]}, which is also how
+    # parse_post_body() wraps a top-level JSON array. None for a single event.
+    items = payload.get("items")
+    if len(payload) == 1 and isinstance(items, list) and all(isinstance(x, dict) for x in items):
+        return items
+    return None
+
+
+def _rfind_newline(f: BinaryIO, before: int) -> int:
+    # Offset of the last b"\n" in `f` before offset `before`, or -1. Reads backwards
+    # in fixed blocks and searches only each new block.
+    pos = before
+    while pos > 0:
+        step = min(4096, pos)
+        pos -= step
+        f.seek(pos)
+        i = f.read(step).rfind(b"\n")
+        if i >= 0:
+            return pos + i
+    return -1
 
-    last = ""
-    with EVENTS_FILE.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                last = line
 
-    if not last:
-        return ""
+def _read_last_received_at() -> str:
+    # Walk back from EOF to the last complete, non-blank line and parse only that.
+    with EVENTS_FILE.open("rb", buffering=0) as f:
+        end = _rfind_newline(f, f.seek(0, os.SEEK_END))
+        while end >= 0:
+            start = _rfind_newline(f, end) + 1
+            f.seek(start)
+            line = f.read(end - start)
+            if line and not line.isspace():
+                try:
+                    item = _json_loads(line)
+                except ValueError:
+                    return ""
+                return str(item.get("received_at") or "")
+            end = start - 1
+    return ""
+
 
+def last_live_event_received_at() -> str:
+    # Safe without LOCK: _sync_live_events() sets _LAST_RECEIVED_AT before it advances
+    # _LIVE_OFFSET, and the tail read touches no shared state. Only the timestamp is
+    # needed here, so unread events are not parsed.
     try:
-        item = json.loads(last)
-    except json.JSONDecodeError:
+        size = os.stat(EVENTS_FILE).st_size
+    except FileNotFoundError:
         return ""
-    return str(item.get("received_at") or "")
+    if size == _LIVE_OFFSET:
+        return _LAST_RECEIVED_AT
+    return _read_last_received_at()
 
 
-def build_data(entries: list[Entry]) -> dict[str, Any]:
+def build_data(entries: Iterable[Entry]) -> dict[str, Any]:
     rows: list[dict[str, Any]] = []
+    seen_orders: set[str] = set()
     for idx, entry in enumerate(entries, start=1):
         if not entry.order_value:
             continue
+        seen_orders.add(entry.order_value)
         rows.append(
             {
                 "id": idx,
@@ -260,12 +608,12 @@ def build_data(entries: list[Entry]) -> dict[str, Any]:
             }
         )
 
-    rows.sort(key=lambda x: (x["order_value"], x["added_time"]))
+    rows.sort(key=itemgetter("order_value", "added_time"))
 
     return {
         "summary": {
             "total_records": len(rows),
-            "unique_orders": len({r["order_value"] for r in rows}),
+            "unique_orders": len(seen_orders),
         },
         "records": rows,
         "meta": {
@@ -275,15 +623,72 @@ def build_data(entries: list[Entry]) -> dict[str, Any]:
     }
 
 
+def _cached_if_fresh(
+    cached: tuple[tuple[tuple[int, int] | None, int, int], bytes, str] | None,
+) -> tuple[bytes, str] | None:
+    # Lock-free GET fast path: the cached (body, ETag) if neither the CSV nor the
+    # journal has moved since it was built. Shared state is only ever rebound whole,
+    # so a racing update at worst makes this miss and the caller takes LOCK.
+    if cached is None:
+        return None
+    try:
+        csv_st = os.stat(BOOTSTRAP_CSV)
+    except FileNotFoundError:
+        return None
+    try:
+        live_st = os.stat(EVENTS_FILE)
+    except FileNotFoundError:
+        live_size, live_inode = 0, _LIVE_INODE
+    else:
+        live_size, live_inode = live_st.st_size, live_st.st_ino
+    key = ((csv_st.st_mtime_ns, csv_st.st_size), _LIVE_GENERATION, live_size)
+    if key != cached[0] or live_inode != _LIVE_INODE:
+        return None
+    return cached[1], cached[2]
+
+
+def records_json() -> tuple[bytes, str]:
+    # Serialized /api/barcode/records body and its ETag, rebuilt only when the CSV
+    # or the journal has changed since it was last built. Callers hold LOCK.
+    global _RECORDS_JSON
+    sig, bootstrap = _bootstrap_snapshot()
+    _sync_live_events()
+    key = (sig, _LIVE_GENERATION, _LIVE_OFFSET)
+    if _RECORDS_JSON is None or _RECORDS_JSON[0] != key:
+        body = _json_dumps(build_data(chain(bootstrap, _LIVE_ENTRIES)))
+        _RECORDS_JSON = (key, body, _etag(body))
+    return _RECORDS_JSON[1], _RECORDS_JSON[2]
+
+
+def _query_param(query: str, name: str) -> str:
+    # First non-blank `name` value in a query string, decoded as parse_qs() would.
+    for field in query.split("&"):
+        key, sep, value = field.partition("=")
+        if sep and value and unquote_plus(key) == name:
+            return unquote_plus(value)
+    return ""
+
+
+class BodyTooLarge(ValueError):
+    pass
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
 def parse_post_body(handler: SimpleHTTPRequestHandler) -> dict[str, Any]:
     length = int(handler.headers.get("Content-Length", "0"))
+    # Refuse before reading, so an oversized body never reaches memory or the parser.
+    if length > CFG["max_body"]:
+        raise BodyTooLarge("body too large")
     body = handler.rfile.read(length) if length > 0 else b""
     ctype = (handler.headers.get("Content-Type") or "").lower()
 
     if "application/json" in ctype:
         if not body:
             return {}
-        data = json.loads(body.decode("utf-8"))
+        data = _json_loads(body)
         if isinstance(data, dict):
             return data
         return {"items": data}
@@ -300,27 +705,47 @@ class Handler(SimpleHTTPRequestHandler):
         super().__init__(*args, directory=str(ROOT), **kwargs)
 
     def _write_json(self, status: int, payload: dict[str, Any]) -> None:
-        b = json.dumps(payload).encode("utf-8")
+        self._write_json_bytes(status, _json_dumps(payload))
+
+    def _write_json_bytes(self, status: int, b: bytes) -> None:
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(b)))
         self.end_headers()
         self.wfile.write(b)
 
-    def _auth_ok(self) -> bool:
+    def _write_cached_json(self, body: bytes, etag: str) -> None:
+        # Clients revalidating a body they already hold get an empty 304 instead.
+        tags = {t.strip().removeprefix("W/") for t in self.headers.get("If-None-Match", "").split(",")}
+        if etag in tags or "*" in tags:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _auth_ok(self, query: str) -> bool:
+        # `query` is the part of self.path after "?", already split off by the caller.
         expected = CFG["webhook_secret"]
         if not expected:
             return True
-        parsed = urlparse(self.path)
-        qs = parse_qs(parsed.query)
-        q_secret = (qs.get("secret") or [""])[0]
-        h_secret = self.headers.get("X-Zoho-Webhook-Secret", "")
-        bearer = self.headers.get("Authorization", "")
-        return expected in (q_secret, h_secret, bearer.replace("Bearer ", ""))
+        secret = expected.encode()
+        candidates = (
+            _query_param(query, "secret") if query else "",
+            self.headers.get("X-Zoho-Webhook-Secret", ""),
+            self.headers.get("Authorization", "").replace("Bearer ", ""),
+        )
+        return any(hmac.compare_digest(secret, c.encode()) for c in candidates)
 
     def do_GET(self) -> None:  # noqa: N802
-        parsed = urlparse(self.path)
-        if parsed.path == "/api/barcode/health":
+        path = self.path.partition("?")[0]
+        if path == "/api/barcode/health":
             self._write_json(
                 HTTPStatus.OK,
                 {
@@ -331,45 +756,62 @@ class Handler(SimpleHTTPRequestHandler):
             )
             return
 
-        if parsed.path == "/api/barcode/records":
-            with LOCK:
-                data = build_data(load_bootstrap_entries() + load_live_entries())
-            self._write_json(HTTPStatus.OK, data)
+        if path == "/api/barcode/records":
+            cached = _cached_if_fresh(_RECORDS_JSON)
+            if cached is None:
+                with LOCK:
+                    cached = records_json()
+            self._write_cached_json(*cached)
             return
 
         return super().do_GET()
 
     def do_POST(self) -> None:  # noqa: N802
-        parsed = urlparse(self.path)
-        if parsed.path != "/api/barcode/webhook":
+        path, _, query = self.path.partition("?")
+        if path != "/api/barcode/webhook":
             self._write_json(HTTPStatus.NOT_FOUND, {"error": "not_found"})
             return
-        if not self._auth_ok():
+        if not self._auth_ok(query):
             self._write_json(HTTPStatus.UNAUTHORIZED, {"error": "unauthorized"})
             return
 
         try:
             payload = parse_post_body(self)
+        except BodyTooLarge as exc:
+            self._write_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "payload_too_large", "detail": str(exc)}
+            )
+            return
         except Exception as exc:  # pragma: no cover
             self._write_json(HTTPStatus.BAD_REQUEST, {"error": "invalid_payload", "detail": str(exc)})
             return
 
-        with LOCK:
-            append_live_event(payload)
-            parsed_entries = parse_live_entries_from_payload(payload)
+        items = split_batch(payload)
+        if items == []:
+            self._write_json(HTTPStatus.BAD_REQUEST, {"error": "invalid_payload", "detail": "empty batch"})
+            return
+        payloads = items if items is not None else [payload]
+        parsed = [parse_live_entries_from_payload(p) for p in payloads]
+        append_live_events(payloads, parsed)
 
         self._write_json(
             HTTPStatus.OK,
             {
                 "ok": True,
-                "received_records": len(parsed_entries),
+                "received_records": sum(len(entries) for entries in parsed),
                 "last_live_event_at": last_live_event_received_at(),
             },
         )
 
 
+class _Server(ThreadingHTTPServer):
+    # socketserver's default listen backlog of 5 makes the kernel reset
+    # connections during webhook bursts or many dashboards loading at once.
+    request_queue_size = 128
+
+
 def main() -> None:
-    server = ThreadingHTTPServer((CFG["host"], CFG["port"]), Handler)
+    server = _Server((CFG["host"], CFG["port"]), Handler)
     print(f"Serving barcode dashboard on http://{CFG['host']}:{CFG['port']}/barcode_dashboard/index.html")
     print("Webhook endpoint:", f"http://{CFG['host']}:{CFG['port']}/api/barcode/webhook")
     if CFG["webhook_secret"]:
@@ -129,7 +129,7 @@ function setSyncMeta(meta) {
 async function boot() {
   let payload = null;
   try {
-    const live = await fetch("/api/orders", { cache: "no-store" });
+    const live = await fetch("/api/orders", { cache: "no-cache" });
     if (live.ok) {
       payload = await live.json();
     }
@@ -10,16 +10,54 @@ ROOT = Path(__file__).resolve().parent.parent
 COMPLETE_CSV = ROOT / "orders_complete_both_received.csv"
 PARTIAL_CSV = ROOT / "orders_partial_one_received.csv"
 OUT_JSON = ROOT / "dashboard" / "dashboard_data.json"
+READ_BUFFER_SIZE = 1 << 20
+
+
+# Columns read from the classified order CSVs, in the order normalize_row() unpacks them.
+FIELDS = (
+    "order_key",
+    "prefix",
+    "ref_number",
+    "paperwork_received",
+    "product_received",
+    "users_seen",
+    "stages_seen",
+    "latest_added_time",
+    "rows_for_order",
+)
 
 
 def load_rows(path: Path):
-    with path.open(newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+    # One csv.reader pass that picks FIELDS by header position, instead of a
+    # DictReader dict per row. Cells come back stripped; missing columns are "".
+    with path.open(newline="", encoding="utf-8", buffering=READ_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        positions = {name: i for i, name in enumerate(header)}
+        idx = [positions.get(name, -1) for name in FIELDS]
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            width = len(row)
+            rows.append([row[i].strip() if 0 <= i < width else "" for i in idx])
+        return rows
 
 
 def normalize_row(row):
-    paperwork = row.get("paperwork_received", "").strip().lower() == "yes"
-    product = row.get("product_received", "").strip().lower() == "yes"
+    (
+        order_key,
+        prefix,
+        ref_number,
+        paperwork_received,
+        product_received,
+        users_seen,
+        stages_seen,
+        latest_added_time,
+        rows_for_order,
+    ) = row
+    paperwork = paperwork_received.lower() == "yes"
+    product = product_received.lower() == "yes"
     order_type = "complete" if paperwork and product else "partial"
 
     partial_type = ""
@@ -30,15 +68,15 @@ def normalize_row(row):
             partial_type = "product_only"
 
     return {
-        "order_key": row.get("order_key", "").strip(),
-        "prefix": row.get("prefix", "").strip(),
-        "ref_number": row.get("ref_number", "").strip(),
+        "order_key": order_key,
+        "prefix": prefix,
+        "ref_number": ref_number,
         "paperwork_received": paperwork,
         "product_received": product,
-        "users_seen": row.get("users_seen", "").strip(),
-        "stages_seen": row.get("stages_seen", "").strip(),
-        "latest_added_time": row.get("latest_added_time", "").strip(),
-        "rows_for_order": int(row.get("rows_for_order", "0") or "0"),
+        "users_seen": users_seen,
+        "stages_seen": stages_seen,
+        "latest_added_time": latest_added_time,
+        "rows_for_order": int(rows_for_order or "0"),
         "order_type": order_type,
         "partial_type": partial_type,
     }
@@ -46,15 +84,24 @@ def normalize_row(row):
 
 def main():
     complete_rows = [normalize_row(r) for r in load_rows(COMPLETE_CSV)]
-    partial_rows = [normalize_row(r) for r in load_rows(PARTIAL_CSV)]
+    # Count partial types while building the rows rather than re-scanning them.
+    partial_rows = []
+    paperwork_only = product_only = 0
+    for r in load_rows(PARTIAL_CSV):
+        row = normalize_row(r)
+        if row["partial_type"] == "paperwork_only":
+            paperwork_only += 1
+        elif row["partial_type"] == "product_only":
+            product_only += 1
+        partial_rows.append(row)
     orders = complete_rows + partial_rows
 
     summary = {
         "total_orders_in_view": len(orders),
         "complete_both": len(complete_rows),
         "partial_one": len(partial_rows),
-        "paperwork_only": sum(1 for r in partial_rows if r["partial_type"] == "paperwork_only"),
-        "product_only": sum(1 for r in partial_rows if r["partial_type"] == "product_only"),
+        "paperwork_only": paperwork_only,
+        "product_only": product_only,
     }
 
     payload = {
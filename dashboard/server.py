@@ -4,23 +4,49 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import hmac
 import json
 import os
+import pickle
+import queue
+import signal
+import sys
 import threading
+from bisect import bisect_left, insort
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from http import HTTPStatus
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
 from pathlib import Path
-from typing import Any
-from urllib.parse import parse_qs, urlparse
+from typing import Any, BinaryIO, Iterable, Iterator
+from urllib.parse import parse_qs, unquote_plus
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json is the fallback
+    orjson = None
 
 
 ROOT = Path(__file__).resolve().parent.parent
 DASHBOARD_DIR = ROOT / "dashboard"
 BOOTSTRAP_CSV = Path(os.getenv("ZP_BOOTSTRAP_CSV", str(ROOT / "PKTracker_Report (2)_filled.csv")))
 EVENTS_FILE = DASHBOARD_DIR / "live_events.jsonl"
+# Checkpoint of the running order aggregate; see _orders_snapshot_state().
+SNAPSHOT_FILE = DASHBOARD_DIR / "orders_snapshot.pkl"
+SNAPSHOT_VERSION = 2
+# Live events folded between checkpoints.
+SNAPSHOT_EVERY = 500
+# Large sequential reads: fewer read() syscalls than the 8 KB default.
+READ_BUFFER_SIZE = 1 << 20
+# Most queued writes (one per webhook request) one fsync may cover.
+WRITE_BATCH_MAX = 64
+WRITE_BUFFER_SIZE = 1 << 16
+# Most field text held in handed-off parse results for lines not yet read back;
+# see append_live_events().
+PARSED_BYTES_MAX = 1 << 22
 
 
 def _split_csv_env(name: str, default: str) -> list[str]:
@@ -31,6 +57,9 @@ CFG = {
     "host": os.getenv("DASHBOARD_HOST", "0.0.0.0"),
     "port": int(os.getenv("PORT", os.getenv("DASHBOARD_PORT", "8000"))),
     "webhook_secret": os.getenv("ZP_WEBHOOK_SECRET", "").strip(),
+    "max_body": int(os.getenv("ZP_MAX_BODY", "1048576")),
+    # Acknowledge webhooks with 202 once queued instead of after the fsync.
+    "async_ingest": os.getenv("ZP_ASYNC_INGEST", "").strip().lower() in {"1", "true", "yes"},
     "prefix_keys": _split_csv_env("ZP_PREFIX_KEYS", "Prefix,prefix"),
     "ref_keys": _split_csv_env("ZP_REF_KEYS", "Ref Number,Reference Number,Ref_Number,ref_number"),
     "stage_keys": _split_csv_env("ZP_STAGE_KEYS", "Stage,stage,Status,status"),
@@ -38,62 +67,249 @@ CFG = {
     "time_keys": _split_csv_env("ZP_TIME_KEYS", "Added Time,added_time,Submitted Time,Submission Time"),
 }
 
+# Lowercased (and de-duplicated) *_keys lists for case-insensitive lookups.
+CFG_LOWER = {
+    name: list(dict.fromkeys(k.lower() for k in keys)) for name, keys in CFG.items() if name.endswith("_keys")
+}
+# Every payload field name any *_keys lookup can ask for.
+_WANTED_KEYS = frozenset(k for keys in CFG_LOWER.values() for k in keys)
+# *_keys lookups made for every payload, in the order _payload_fields() returns them.
+_PAYLOAD_FIELDS = ("prefix_keys", "ref_keys", "stage_keys", "user_keys", "time_keys")
+# Most distinct flat-payload key layouts remembered by _flat_plan(). Only layouts
+# of at most FLAT_PLAN_MAX_KEYS keys, FLAT_PLAN_MAX_KEY_CHARS characters in all, are
+# remembered, so the cache stays small however large the payloads are.
+FLAT_PLANS_MAX = 256
+FLAT_PLAN_MAX_KEYS = 64
+FLAT_PLAN_MAX_KEY_CHARS = 4096
+
 
 LOCK = threading.Lock()
 
+# ((st_mtime_ns, st_size), entries) for BOOTSTRAP_CSV; guarded by LOCK.
+_BOOTSTRAP_CACHE: tuple[tuple[int, int], tuple[Entry, ...]] | None = None
+
+# Live events parsed but not yet folded into _ORDERS, and the EVENTS_FILE byte offset
+# consumed; guarded by LOCK. Folded events are dropped, so rebuilding the aggregate
+# means re-reading the journal from the start (see _sync_orders()).
+_LIVE_OFFSET = 0
+_LIVE_ENTRIES: list[Entry] = []
+_LAST_RECEIVED_AT = ""
+# Journal inode, and a counter bumped whenever the journal is truncated or
+# replaced and the live state above is rebuilt from scratch.
+_LIVE_INODE = 0
+_LIVE_GENERATION = 0
+
+# Serialized /api/orders body keyed on (bootstrap signature, _LIVE_GENERATION,
+# _LIVE_OFFSET), with its ETag; guarded by LOCK.
+_ORDERS_JSON: tuple[tuple[tuple[int, int] | None, int, int], bytes, str] | None = None
+
+# Journal lines waiting for the background writer; see append_live_events().
+_WRITE_Q: queue.SimpleQueue[_PendingWrite] = queue.SimpleQueue()
+_WRITER: threading.Thread | None = None
+_WRITER_LOCK = threading.Lock()
+# Append handle kept open across batches; only the writer thread touches it.
+_EVENTS_FH: BinaryIO | None = None
+# Journal lines written by this process, keyed by _line_key() and mapped to
+# (received_at, parsed payload, _parsed_size()), so _sync_live_events can skip
+# decoding them again. _PARSED_BYTES totals the sizes; both guarded by _PARSED_LOCK.
+_PARSED_LINES: dict[bytes, tuple[str, Entry, int]] = {}
+_PARSED_BYTES = 0
+_PARSED_LOCK = threading.Lock()
+
+# Running per-order aggregate: bootstrap entries plus every live event read up to
+# _LIVE_OFFSET, folded in order. Rebuilt when _ORDERS_SIG (bootstrap CSV signature,
+# _LIVE_GENERATION) changes.
+_ORDERS: dict[str, _OrderAgg] | None = None
+_ORDERS_SIG: tuple[tuple[int, int] | None, int] | None = None
+# Orders per summary category in _ORDERS, kept in step with each fold so a
+# webhook can report the summary without re-walking every order.
+_ORDERS_COUNTS: dict[str, int] = defaultdict(int)
+# (prefix, ref_number, order key) for every order in _ORDERS, kept sorted so rows
+# come out in display order without re-sorting on each rebuild.
+_ORDERS_INDEX: list[tuple[str, str, str]] = []
+# Live events folded since SNAPSHOT_FILE was last written.
+_ORDERS_UNSAVED = 0
+
+# Checkpoints waiting to be pickled and written; see _queue_orders_snapshot().
+_SNAPSHOT_Q: queue.SimpleQueue[tuple[int, dict[str, Any]]] = queue.SimpleQueue()
+_SNAPSHOT_WRITER: threading.Thread | None = None
+# Checkpoints are numbered when taken (under LOCK); _SNAPSHOT_WRITTEN is the newest
+# one on disk, so an older one finishing late never replaces it. _OrderAgg.seq
+# compares against _SNAPSHOT_SEQ to tell which orders a checkpoint may still share.
+_SNAPSHOT_SEQ = 0
+_SNAPSHOT_WRITTEN = 0
+_SNAPSHOT_WRITE_LOCK = threading.Lock()
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_line(obj: Any) -> bytes:
+    # One newline-terminated JSONL record; orjson appends the newline itself.
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj).encode("utf-8") + b"\n"
+
+
+def _advise_sequential(f: Any, offset: int = 0) -> None:
+    # Where supported (Linux), start kernel readahead for the rest of the file so
+    # cold-cache reads overlap with parsing instead of stalling on each refill.
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(f.fileno(), offset, 0, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(f.fileno(), offset, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+
+# Stage bits folded into _OrderAgg.flags, keyed by normalized stage name.
+STAGE_PAPERWORK = 1
+STAGE_PRODUCT = 2
+STAGE_MACHINES = 4
+STAGE_SHIPPING = 8
+_STAGE_FLAGS = {
+    "paperwork received": STAGE_PAPERWORK,
+    "product received": STAGE_PRODUCT,
+    "move to machines": STAGE_MACHINES,
+    "move to shipping": STAGE_SHIPPING,
+}
+
+# Most distinct stage values remembered by _canonical_stage().
+STAGE_CACHE_MAX = 1024
+_STAGE_CANON: dict[str, tuple[str, int]] = {}
 
-@dataclass
+
+def _canonical_stage(stage: str) -> tuple[str, int]:
+    # (shared string, STAGE_* bit) for a stage value, already stripped by its
+    # source. A handful of stage values repeat across every row, so each distinct
+    # one is lowercased and matched once and every entry then shares one object.
+    canon = _STAGE_CANON.get(stage)
+    if canon is None:
+        canon = (stage, _STAGE_FLAGS.get(stage.lower(), 0))
+        if len(_STAGE_CANON) < STAGE_CACHE_MAX:
+            _STAGE_CANON[stage] = canon
+    return canon
+
+
+@dataclass(slots=True)
 class Entry:
     prefix: str
     ref_number: str
     stage: str
     user: str
     added_time: str
-    raw: dict[str, Any]
-
-
-def flatten(data: Any, prefix: str = "", out: dict[str, str] | None = None) -> dict[str, str]:
-    if out is None:
-        out = {}
-    if isinstance(data, dict):
-        for key, value in data.items():
-            key_s = str(key)
-            p = f"{prefix}.{key_s}" if prefix else key_s
-            flatten(value, p, out)
-            if not isinstance(value, (dict, list)):
-                out[key_s] = str(value)
-    elif isinstance(data, list):
-        for idx, value in enumerate(data):
-            p = f"{prefix}[{idx}]"
-            flatten(value, p, out)
-    else:
-        out[prefix] = str(data)
-    return out
-
-
-def first_value(flat: dict[str, str], keys: list[str]) -> str:
-    lowered = {k.lower(): v for k, v in flat.items()}
+    # STAGE_* bit for `stage`, resolved once when the entry is built.
+    stage_flag: int = 0
+
+
+def _extract_wanted(payload: Any) -> dict[str, str]:
+    # Depth-first walk keeping only scalar leaves whose lowercased key is in
+    # _WANTED_KEYS; everything else is dropped without building strings for it.
+    # Leaves are keyed by exact name first (later duplicates win), then folded to
+    # lowercase, so keys differing only in case resolve as a full flatten would.
+    exact: dict[str, tuple[str, str]] = {}
+    stack: list[tuple[str, Any]] = [("", payload)]
+    while stack:
+        key, value = stack.pop()
+        if isinstance(value, dict):
+            children = []
+            for child_key, child in value.items():
+                if isinstance(child, (dict, list)):
+                    children.append(("", child))
+                else:
+                    child_key = str(child_key)
+                    if child_key.lower() in _WANTED_KEYS:
+                        children.append((child_key, child))
+            children.reverse()
+            stack.extend(children)
+        elif isinstance(value, list):
+            # Scalars directly inside a list have no key to match; skip them here.
+            stack.extend(("", child) for child in reversed(value) if isinstance(child, (dict, list)))
+        elif key:
+            exact[key] = (key.lower(), str(value).strip())
+    return dict(exact.values())
+
+
+def first_value(lowered: dict[str, str], keys: list[str]) -> str:
+    # `lowered` is an _extract_wanted() result (lowercased keys, stripped values),
+    # built once per payload; `keys` is a CFG_LOWER list.
     for key in keys:
-        v = lowered.get(key.lower())
-        if v is not None and str(v).strip():
-            return str(v).strip()
+        v = lowered.get(key)
+        if v:
+            return v
     return ""
 
 
+_FLAT_PLANS: dict[tuple[Any, ...], tuple[tuple[Any, ...], ...]] = {}
+
+
+def _flat_plan(keys: tuple[Any, ...]) -> tuple[tuple[Any, ...], ...]:
+    # For a flat payload with these keys (in order), the payload keys that can
+    # answer each _PAYLOAD_FIELDS lookup, in lookup order. Mirrors _extract_wanted():
+    # among keys equal up to case, the last one wins.
+    plan = _FLAT_PLANS.get(keys)
+    if plan is None:
+        last: dict[str, Any] = {}
+        for key in keys:
+            lowered = str(key).lower()
+            if lowered in _WANTED_KEYS:
+                last[lowered] = key
+        plan = tuple(tuple(last[k] for k in CFG_LOWER[name] if k in last) for name in _PAYLOAD_FIELDS)
+        if len(_FLAT_PLANS) < FLAT_PLANS_MAX and sum(len(str(k)) for k in keys) <= FLAT_PLAN_MAX_KEY_CHARS:
+            _FLAT_PLANS[keys] = plan
+    return plan
+
+
+def _payload_fields(payload: Any) -> list[str]:
+    # first_value() of each _PAYLOAD_FIELDS lookup. Webhooks from one form send the
+    # same flat layout every time, so those are answered from a cached per-layout
+    # plan with a few direct lookups; nested or very wide payloads take the full walk.
+    if (
+        isinstance(payload, dict)
+        and len(payload) <= FLAT_PLAN_MAX_KEYS
+        and not any(isinstance(v, (dict, list)) for v in payload.values())
+    ):
+        out = []
+        for candidates in _flat_plan(tuple(payload)):
+            value = ""
+            for key in candidates:
+                value = str(payload[key]).strip()
+                if value:
+                    break
+            out.append(value)
+        return out
+    lowered = _extract_wanted(payload)
+    return [first_value(lowered, CFG_LOWER[name]) for name in _PAYLOAD_FIELDS]
+
+
 def normalize_payload(payload: dict[str, Any]) -> Entry:
-    flat = flatten(payload)
-    prefix = first_value(flat, CFG["prefix_keys"])
-    ref_number = first_value(flat, CFG["ref_keys"])
-    stage = first_value(flat, CFG["stage_keys"])
-    user = first_value(flat, CFG["user_keys"])
-    added_time = first_value(flat, CFG["time_keys"])
-    return Entry(prefix=prefix, ref_number=ref_number, stage=stage, user=user, added_time=added_time, raw=payload)
+    prefix, ref_number, stage, user, added_time = _payload_fields(payload)
+    stage, stage_flag = _canonical_stage(stage)
+    return Entry(
+        prefix=prefix,
+        ref_number=ref_number,
+        stage=stage,
+        user=user,
+        added_time=added_time,
+        stage_flag=stage_flag,
+    )
 
 
 def _find_column_index(header: list[str], keys: list[str]) -> int:
+    # `keys` must already be lowercase (see CFG_LOWER).
     lookup = {c.strip().lower(): i for i, c in enumerate(header) if c.strip()}
     for key in keys:
-        idx = lookup.get(key.lower())
+        idx = lookup.get(key)
         if idx is not None:
             return idx
     return -1
@@ -105,28 +321,35 @@ def _cell(row: list[str], idx: int) -> str:
     return (row[idx] or "").strip()
 
 
-def load_bootstrap_entries() -> list[Entry]:
-    if not BOOTSTRAP_CSV.exists():
-        return []
+def _read_bootstrap_entries() -> list[Entry]:
+    with BOOTSTRAP_CSV.open(newline="", encoding="utf-8", buffering=READ_BUFFER_SIZE) as f:
+        _advise_sequential(f)
+        return _parse_bootstrap_rows(csv.reader(f))
+
+
+# Ref Number cell values that mark a repeated field-name row in Zoho exports.
+_REF_SENTINELS = frozenset({"ref number", "reference number", "ref_number"})
 
-    with BOOTSTRAP_CSV.open(newline="", encoding="utf-8") as f:
-        rows = list(csv.reader(f))
 
-    if not rows:
+def _parse_bootstrap_rows(reader: Iterator[list[str]]) -> list[Entry]:
+    # Rows are consumed as the reader yields them; the file is never held as a list.
+    first = next(reader, None)
+    if first is None:
         return []
+    second = next(reader, None)
 
-    header_row = [c.strip() for c in rows[0]]
-    second_row = [c.strip() for c in rows[1]] if len(rows) > 1 else []
+    header_row = [c.strip() for c in first]
+    second_row = [c.strip() for c in second] if second is not None else []
 
-    prefix_idx = _find_column_index(header_row, CFG["prefix_keys"] + ["Reference Numbers"])
-    ref_idx = _find_column_index(header_row, CFG["ref_keys"])
-    user_idx = _find_column_index(header_row, CFG["user_keys"])
-    stage_idx = _find_column_index(header_row, CFG["stage_keys"])
-    time_idx = _find_column_index(header_row, CFG["time_keys"])
+    prefix_idx = _find_column_index(header_row, CFG_LOWER["prefix_keys"] + ["reference numbers"])
+    ref_idx = _find_column_index(header_row, CFG_LOWER["ref_keys"])
+    user_idx = _find_column_index(header_row, CFG_LOWER["user_keys"])
+    stage_idx = _find_column_index(header_row, CFG_LOWER["stage_keys"])
+    time_idx = _find_column_index(header_row, CFG_LOWER["time_keys"])
     data_start = 1
 
-    second_prefix_idx = _find_column_index(second_row, CFG["prefix_keys"])
-    second_ref_idx = _find_column_index(second_row, CFG["ref_keys"])
+    second_prefix_idx = _find_column_index(second_row, CFG_LOWER["prefix_keys"])
+    second_ref_idx = _find_column_index(second_row, CFG_LOWER["ref_keys"])
     if second_prefix_idx >= 0 and second_ref_idx >= 0:
         prefix_idx = second_prefix_idx
         ref_idx = second_ref_idx
@@ -136,8 +359,12 @@ def load_bootstrap_entries() -> list[Entry]:
     previous_user = ""
     previous_stage = ""
 
-    for row in rows[data_start:]:
-        if not any(c.strip() for c in row):
+    data_rows: Iterable[list[str]] = reader
+    if data_start == 1 and second is not None:
+        data_rows = chain([second], reader)
+
+    for row in data_rows:
+        if not "".join(row).strip():
             continue
 
         prefix = _cell(row, prefix_idx)
@@ -147,7 +374,7 @@ def load_bootstrap_entries() -> list[Entry]:
         added_time = _cell(row, time_idx)
 
         # Zoho report exports can include repeated field-name rows.
-        if ref_number.lower() in {"ref number", "reference number", "ref_number"}:
+        if ref_number.lower() in _REF_SENTINELS:
             continue
 
         # Business rule: when both USER and Stage are blank, inherit from previous row.
@@ -163,6 +390,7 @@ def load_bootstrap_entries() -> list[Entry]:
         if not ref_number:
             continue
 
+        stage, stage_flag = _canonical_stage(stage)
         entries.append(
             Entry(
                 prefix=prefix,
@@ -170,158 +398,667 @@ def load_bootstrap_entries() -> list[Entry]:
                 stage=stage,
                 user=user,
                 added_time=added_time,
-                raw={
-                    "prefix": prefix,
-                    "ref_number": ref_number,
-                    "stage": stage,
-                    "user": user,
-                    "added_time": added_time,
-                },
+                stage_flag=stage_flag,
             )
         )
 
     return entries
 
 
-def load_live_entries() -> list[Entry]:
-    if not EVENTS_FILE.exists():
-        return []
-    entries: list[Entry] = []
-    with EVENTS_FILE.open(encoding="utf-8") as f:
+def _bootstrap_snapshot() -> tuple[tuple[int, int] | None, tuple[Entry, ...]]:
+    # Re-parse the CSV only when it changes on disk. Callers hold LOCK.
+    global _BOOTSTRAP_CACHE
+    try:
+        st = os.stat(BOOTSTRAP_CSV)
+    except FileNotFoundError:
+        _BOOTSTRAP_CACHE = None
+        return None, ()
+
+    sig = (st.st_mtime_ns, st.st_size)
+    if _BOOTSTRAP_CACHE is None or _BOOTSTRAP_CACHE[0] != sig:
+        # Stored as a tuple so nothing holding the snapshot can mutate the cache.
+        _BOOTSTRAP_CACHE = (sig, tuple(_read_bootstrap_entries()))
+    return _BOOTSTRAP_CACHE
+
+
+def _reset_live() -> None:
+    # Forget everything read from the journal so the next sync starts at byte 0.
+    # Bumping the generation makes anything derived from it rebuild. Callers hold LOCK.
+    global _LIVE_OFFSET, _LIVE_ENTRIES, _LAST_RECEIVED_AT, _LIVE_GENERATION
+    _LIVE_ENTRIES = []
+    _LAST_RECEIVED_AT = ""
+    _forget_parsed()
+    _LIVE_OFFSET = 0
+    _LIVE_GENERATION += 1
+
+
+def _sync_live_events() -> None:
+    # Parse only lines appended since the last call. Callers hold LOCK.
+    global _LIVE_OFFSET, _LAST_RECEIVED_AT, _LIVE_INODE
+    try:
+        st = os.stat(EVENTS_FILE)
+    except FileNotFoundError:
+        size, inode = 0, _LIVE_INODE
+    else:
+        size, inode = st.st_size, st.st_ino
+
+    if size < _LIVE_OFFSET or (inode != _LIVE_INODE and _LIVE_OFFSET):
+        # Truncated, removed or replaced: what we parsed no longer matches the file.
+        _reset_live()
+    _LIVE_INODE = inode
+    if size == _LIVE_OFFSET:
+        return
+
+    with EVENTS_FILE.open("rb", buffering=READ_BUFFER_SIZE) as f:
+        _advise_sequential(f, _LIVE_OFFSET)
+        f.seek(_LIVE_OFFSET)
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            item = json.loads(line)
-            payload = item.get("payload", {})
-            entries.append(normalize_payload(payload))
-    return entries
-
-
-def append_live_event(payload: dict[str, Any]) -> None:
+            # A line without its newline is still being written; read it next time.
+            if not line.endswith(b"\n"):
+                break
+            known = _take_parsed(_line_key(line)) if _PARSED_LINES else None
+            if known is not None:
+                _LAST_RECEIVED_AT, entry = known
+                _LIVE_ENTRIES.append(entry)
+            elif not line.isspace():
+                item = _json_loads(line)
+                _LIVE_ENTRIES.append(normalize_payload(item.get("payload", {})))
+                _LAST_RECEIVED_AT = str(item.get("received_at") or "")
+            _LIVE_OFFSET += len(line)
+
+
+def _line_key(line: bytes) -> bytes:
+    # Fixed-size stand-in for a journal line in _PARSED_LINES.
+    return hashlib.blake2b(line, digest_size=16).digest()
+
+
+def _parsed_size(e: Entry) -> int:
+    # Field text a handed-off parse result holds, for the PARSED_BYTES_MAX cap.
+    return len(e.prefix) + len(e.ref_number) + len(e.stage) + len(e.user) + len(e.added_time)
+
+
+def _hand_off(lines: list[bytes], received_at: str, parsed: list[Entry]) -> list[bytes]:
+    # Remember each line's parse result until it is read back, while the total stays
+    # within PARSED_BYTES_MAX; past that, lines are simply decoded again. Returns the
+    # keys actually stored.
+    global _PARSED_BYTES
+    keys = []
+    with _PARSED_LOCK:
+        for line, result in zip(lines, parsed):
+            key = _line_key(line)
+            size = _parsed_size(result)
+            if _PARSED_BYTES + size > PARSED_BYTES_MAX:
+                break
+            if key not in _PARSED_LINES:
+                _PARSED_LINES[key] = (received_at, result, size)
+                _PARSED_BYTES += size
+                keys.append(key)
+    return keys
+
+
+def _take_parsed(key: bytes) -> tuple[str, Entry] | None:
+    global _PARSED_BYTES
+    with _PARSED_LOCK:
+        known = _PARSED_LINES.pop(key, None)
+        if known is None:
+            return None
+        _PARSED_BYTES -= known[2]
+    return known[0], known[1]
+
+
+def _forget_parsed(keys: list[bytes] | None = None) -> None:
+    # Drop the given handed-off results, or all of them.
+    global _PARSED_BYTES
+    with _PARSED_LOCK:
+        if keys is None:
+            _PARSED_LINES.clear()
+            _PARSED_BYTES = 0
+            return
+        for key in keys:
+            known = _PARSED_LINES.pop(key, None)
+            if known is not None:
+                _PARSED_BYTES -= known[2]
+
+
+class _PendingWrite:
+    # One or more complete journal lines, written together. `keys` are the
+    # _PARSED_LINES entries handed off for them, dropped again if the write fails.
+    __slots__ = ("data", "keys", "done", "error")
+
+    def __init__(self, data: bytes, keys: list[bytes] | None = None) -> None:
+        self.data = data
+        self.keys = keys
+        self.done = threading.Event()
+        self.error: OSError | None = None
+
+
+def _events_handle() -> BinaryIO:
+    # Reuse the open journal handle unless the file was removed or replaced
+    # underneath it, in which case appends would land in an orphaned inode.
+    global _EVENTS_FH
+    fh = _EVENTS_FH
+    if fh is not None:
+        try:
+            if os.stat(EVENTS_FILE).st_ino == os.fstat(fh.fileno()).st_ino:
+                return fh
+        except FileNotFoundError:
+            pass
+        _close_events_handle()
     EVENTS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    event = {
-        "received_at": datetime.now(timezone.utc).isoformat(),
-        "payload": payload,
-    }
-    with EVENTS_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(event) + "\n")
+    _EVENTS_FH = EVENTS_FILE.open("ab", buffering=WRITE_BUFFER_SIZE)
+    return _EVENTS_FH
 
 
-def last_live_event_received_at() -> str:
-    if not EVENTS_FILE.exists():
-        return ""
+def _close_events_handle() -> None:
+    global _EVENTS_FH
+    fh, _EVENTS_FH = _EVENTS_FH, None
+    if fh is not None:
+        try:
+            fh.close()
+        except OSError:
+            pass
+
+
+def _event_writer() -> None:
+    # Group commit: take whatever queued up while the previous fsync ran and make it
+    # durable with one write + fsync, then release every waiting request.
+    while True:
+        batch = [_WRITE_Q.get()]
+        while len(batch) < WRITE_BATCH_MAX:
+            try:
+                batch.append(_WRITE_Q.get_nowait())
+            except queue.Empty:
+                break
+
+        error = None
+        try:
+            f = _events_handle()
+            f.writelines(p.data for p in batch)
+            f.flush()
+            os.fsync(f.fileno())
+        except OSError as exc:
+            # Start the next batch from a fresh handle rather than one whose
+            # buffer may still hold part of this batch.
+            _close_events_handle()
+            error = exc
+            # Requests that did not wait for this batch never see the error.
+            print(f"Failed to write {len(batch)} queued live event write(s): {exc}", file=sys.stderr)
+        for p in batch:
+            if error is not None and p.keys:
+                _forget_parsed(p.keys)
+            p.error = error
+            p.done.set()
+
+
+def _ensure_writer() -> None:
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = threading.Thread(target=_event_writer, name="live-events-writer", daemon=True)
+            _WRITER.start()
+
+
+def _drain_writes() -> None:
+    # Block until everything queued so far has been written and fsynced.
+    if _WRITER is None:
+        return
+    marker = _PendingWrite(b"")
+    _WRITE_Q.put(marker)
+    marker.done.wait()
+
+
+def append_live_events(
+    payloads: list[dict[str, Any]], entries: list[Entry] | None = None, wait: bool = True
+) -> None:
+    # Journal one line per payload as a single queued write, so a batch shares one
+    # fsync and one wait. Returns once every line is on disk, or with wait=False as
+    # soon as they are queued (write errors are then only logged). Call without LOCK
+    # so concurrent webhooks can share a batch. `entries`, if given, holds
+    # normalize_payload() of each payload; those results are reused when the lines are
+    # read back instead of decoding them again.
+    if not payloads:
+        return
+    received_at = datetime.now(timezone.utc).isoformat()
+    lines = [_json_line({"received_at": received_at, "payload": payload}) for payload in payloads]
+    keys = _hand_off(lines, received_at, entries) if entries is not None else None
+    pending = _PendingWrite(b"".join(lines), keys)
+    _ensure_writer()
+    _WRITE_Q.put(pending)
+    if not wait:
+        return
+    pending.done.wait()
+    if pending.error is not None:
+        raise pending.error
+
+
+def split_batch(payload: dict[str, Any]) -> list[dict[str, Any]] | None:
+    # The events of a batched POST: {"items": [{...}, ...]}, which is also how
+    # parse_post_body() wraps a top-level JSON array. None for a single event.
+    items = payload.get("items")
+    if len(payload) == 1 and isinstance(items, list) and all(isinstance(x, dict) for x in items):
+        return items
+    return None
+
+
+def _rfind_newline(f: BinaryIO, before: int) -> int:
+    # Offset of the last b"\n" in `f` before offset `before`, or -1. Reads backwards
+    # in fixed blocks and searches only each new block.
+    pos = before
+    while pos > 0:
+        step = min(4096, pos)
+        pos -= step
+        f.seek(pos)
+        i = f.read(step).rfind(b"\n")
+        if i >= 0:
+            return pos + i
+    return -1
 
-    last = ""
-    with EVENTS_FILE.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                last = line
 
-    if not last:
-        return ""
+def _read_last_received_at() -> str:
+    # Walk back from EOF to the last complete, non-blank line and parse only that.
+    with EVENTS_FILE.open("rb", buffering=0) as f:
+        end = _rfind_newline(f, f.seek(0, os.SEEK_END))
+        while end >= 0:
+            start = _rfind_newline(f, end) + 1
+            f.seek(start)
+            line = f.read(end - start)
+            if line and not line.isspace():
+                try:
+                    item = _json_loads(line)
+                except ValueError:
+                    return ""
+                return str(item.get("received_at") or "")
+            end = start - 1
+    return ""
+
 
+def last_live_event_received_at() -> str:
+    # Safe without LOCK: _sync_live_events() sets _LAST_RECEIVED_AT before it advances
+    # _LIVE_OFFSET, and the tail read touches no shared state. Only the timestamp is
+    # needed here, so unread events are not parsed.
     try:
-        item = json.loads(last)
-    except json.JSONDecodeError:
+        size = os.stat(EVENTS_FILE).st_size
+    except FileNotFoundError:
         return ""
-    return str(item.get("received_at") or "")
-
-
-def classify(entries: list[Entry]) -> dict[str, Any]:
-    orders = defaultdict(
-        lambda: {
-            "prefix": "",
-            "ref_number": "",
-            "paperwork_received": False,
-            "product_received": False,
-            "move_to_machines": False,
-            "move_to_shipping": False,
-            "users_seen": set(),
-            "stages_seen": set(),
-            "latest_added_time": "",
-            "rows_for_order": 0,
-        }
+    if size == _LIVE_OFFSET:
+        return _LAST_RECEIVED_AT
+    return _read_last_received_at()
+
+
+class _OrderAgg:
+    # Running per-order state folded from entries; one per order key.
+    __slots__ = (
+        "prefix",
+        "ref_number",
+        "flags",
+        "users_seen",
+        "stages_seen",
+        "latest_added_time",
+        "rows_for_order",
+        "seq",
     )
 
-    for e in entries:
-        if not e.ref_number:
-            continue
-        order_key = f"{e.prefix}-{e.ref_number}" if e.prefix else e.ref_number
-        o = orders[order_key]
-        o["prefix"] = e.prefix
-        o["ref_number"] = e.ref_number
-        if e.user:
-            o["users_seen"].add(e.user)
-        if e.stage:
-            o["stages_seen"].add(e.stage)
-            s = e.stage.strip().lower()
-            if s == "paperwork received":
-                o["paperwork_received"] = True
-            if s == "product received":
-                o["product_received"] = True
-            if s == "move to machines":
-                o["move_to_machines"] = True
-            if s == "move to shipping":
-                o["move_to_shipping"] = True
-        if e.added_time:
-            o["latest_added_time"] = e.added_time
-        o["rows_for_order"] += 1
-
+    def __init__(self) -> None:
+        self.prefix = ""
+        self.ref_number = ""
+        self.flags = 0
+        self.users_seen: set[str] = set()
+        self.stages_seen: set[str] = set()
+        self.latest_added_time = ""
+        self.rows_for_order = 0
+        # _SNAPSHOT_SEQ when created; anything older may be in a checkpoint.
+        self.seq = _SNAPSHOT_SEQ
+
+
+def _copy_order(o: _OrderAgg) -> _OrderAgg:
+    c = _OrderAgg()
+    c.prefix = o.prefix
+    c.ref_number = o.ref_number
+    c.flags = o.flags
+    c.users_seen = set(o.users_seen)
+    c.stages_seen = set(o.stages_seen)
+    c.latest_added_time = o.latest_added_time
+    c.rows_for_order = o.rows_for_order
+    return c
+
+
+def _order_key(e: Entry) -> str:
+    return f"{e.prefix}-{e.ref_number}" if e.prefix else e.ref_number
+
+
+def _order_category(o: _OrderAgg) -> str:
+    # "" means the order is not shown (neither stage received yet).
+    flags = o.flags
+    if flags & STAGE_PAPERWORK:
+        return "complete" if flags & STAGE_PRODUCT else "paperwork_only"
+    return "product_only" if flags & STAGE_PRODUCT else ""
+
+
+def _fold_entry(orders: dict[str, _OrderAgg], e: Entry) -> None:
+    if not e.ref_number:
+        return
+    o = orders[_order_key(e)]
+    o.prefix = e.prefix
+    o.ref_number = e.ref_number
+    if e.user:
+        o.users_seen.add(e.user)
+    if e.stage:
+        o.stages_seen.add(e.stage)
+        o.flags |= e.stage_flag
+    if e.added_time:
+        o.latest_added_time = e.added_time
+    o.rows_for_order += 1
+
+
+def _order_index(orders: dict[str, _OrderAgg]) -> list[tuple[str, str, str]]:
+    # (prefix, ref_number) is unique per order key, so the key never breaks ties.
+    return sorted([(o.prefix, o.ref_number, order_key) for order_key, o in orders.items()])
+
+
+def _summarize_orders(orders: dict[str, _OrderAgg], index: list[tuple[str, str, str]]) -> dict[str, Any]:
+    # `index` is the _order_index() of `orders`; rows are emitted in its order.
     rows: list[dict[str, Any]] = []
-    for order_key, o in orders.items():
-        partial_type = ""
-        if not (o["paperwork_received"] and o["product_received"]):
-            if o["paperwork_received"] and not o["product_received"]:
-                partial_type = "paperwork_only"
-            elif o["product_received"] and not o["paperwork_received"]:
-                partial_type = "product_only"
-        order_type = "complete" if (o["paperwork_received"] and o["product_received"]) else "partial_or_other"
-        if partial_type:
-            order_type = "partial"
-        elif order_type == "partial_or_other":
+    complete_both = paperwork_only = product_only = 0
+    for _, _, order_key in index:
+        o = orders[order_key]
+        flags = o.flags
+        category = _order_category(o)
+        if not category:
             continue
+        if category == "complete":
+            complete_both += 1
+            order_type, partial_type = "complete", ""
+        else:
+            if category == "paperwork_only":
+                paperwork_only += 1
+            else:
+                product_only += 1
+            order_type, partial_type = "partial", category
 
         rows.append(
             {
                 "order_key": order_key,
-                "prefix": o["prefix"],
-                "ref_number": o["ref_number"],
-                "paperwork_received": o["paperwork_received"],
-                "product_received": o["product_received"],
-                "move_to_machines": o["move_to_machines"],
-                "move_to_shipping": o["move_to_shipping"],
-                "users_seen": "; ".join(sorted(o["users_seen"])),
-                "stages_seen": "; ".join(sorted(o["stages_seen"])),
-                "latest_added_time": o["latest_added_time"],
-                "rows_for_order": o["rows_for_order"],
+                "prefix": o.prefix,
+                "ref_number": o.ref_number,
+                "paperwork_received": bool(flags & STAGE_PAPERWORK),
+                "product_received": bool(flags & STAGE_PRODUCT),
+                "move_to_machines": bool(flags & STAGE_MACHINES),
+                "move_to_shipping": bool(flags & STAGE_SHIPPING),
+                "users_seen": "; ".join(sorted(o.users_seen)),
+                "stages_seen": "; ".join(sorted(o.stages_seen)),
+                "latest_added_time": o.latest_added_time,
+                "rows_for_order": o.rows_for_order,
                 "order_type": order_type,
                 "partial_type": partial_type,
             }
         )
 
-    rows.sort(key=lambda x: (x["prefix"], x["ref_number"]))
+    return {"summary": _summary(complete_both, paperwork_only, product_only), "orders": rows}
+
+
+def _summary(complete_both: int, paperwork_only: int, product_only: int) -> dict[str, int]:
+    return {
+        "total_orders_in_view": complete_both + paperwork_only + product_only,
+        "complete_both": complete_both,
+        "partial_one": paperwork_only + product_only,
+        "paperwork_only": paperwork_only,
+        "product_only": product_only,
+    }
+
 
-    summary = {
-        "total_orders_in_view": len(rows),
-        "complete_both": sum(1 for r in rows if r["order_type"] == "complete"),
-        "partial_one": sum(1 for r in rows if r["order_type"] == "partial"),
-        "paperwork_only": sum(1 for r in rows if r["partial_type"] == "paperwork_only"),
-        "product_only": sum(1 for r in rows if r["partial_type"] == "product_only"),
+def _sync_orders() -> dict[str, _OrderAgg]:
+    # Fold only what changed since the last call. Callers hold LOCK.
+    global _ORDERS, _ORDERS_SIG, _ORDERS_INDEX, _ORDERS_UNSAVED, _LIVE_ENTRIES
+    bootstrap_sig, bootstrap = _bootstrap_snapshot()
+    if _ORDERS_SIG is not None and _ORDERS_SIG[0] != bootstrap_sig:
+        # The CSV changed; folded live events are gone, so re-read them all.
+        _reset_live()
+    _sync_live_events()
+    sig = (bootstrap_sig, _LIVE_GENERATION)
+    counts = _ORDERS_COUNTS
+    if _ORDERS is None or sig != _ORDERS_SIG:
+        _ORDERS = defaultdict(_OrderAgg)
+        for e in bootstrap:
+            _fold_entry(_ORDERS, e)
+        counts.clear()
+        for o in _ORDERS.values():
+            counts[_order_category(o)] += 1
+        _ORDERS_INDEX = _order_index(_ORDERS)
+        _ORDERS_SIG = sig
+
+    orders = _ORDERS
+    index = _ORDERS_INDEX
+    for e in _LIVE_ENTRIES:
+        if not e.ref_number:
+            continue
+        order_key = _order_key(e)
+        o = orders.get(order_key)
+        if o is None:
+            before = None
+            insort(index, (e.prefix, e.ref_number, order_key))
+        else:
+            if o.seq != _SNAPSHOT_SEQ:
+                # A checkpoint taken since may still be pickling `o`; fold into a copy.
+                o = orders[order_key] = _copy_order(o)
+            before = _order_category(o)
+            if (o.prefix, o.ref_number) != (e.prefix, e.ref_number):
+                # Keys like "A-B-C" can come from different prefix/ref splits;
+                # the order takes the latest split, so move its index slot.
+                del index[bisect_left(index, (o.prefix, o.ref_number, order_key))]
+                insort(index, (e.prefix, e.ref_number, order_key))
+        _fold_entry(orders, e)
+        after = _order_category(orders[order_key])
+        if before != after:
+            if before is not None:
+                counts[before] -= 1
+            counts[after] += 1
+    _ORDERS_UNSAVED += len(_LIVE_ENTRIES)
+    _LIVE_ENTRIES = []
+    if _ORDERS_UNSAVED >= SNAPSHOT_EVERY:
+        _queue_orders_snapshot()
+    return orders
+
+
+def orders_summary() -> dict[str, int]:
+    # Summary counts only, without materializing the order rows. Callers hold LOCK.
+    _sync_orders()
+    c = _ORDERS_COUNTS
+    return _summary(c["complete"], c["paperwork_only"], c["product_only"])
+
+
+def _fold_config() -> tuple[dict[str, list[str]], dict[str, int]]:
+    # The settings that decide how payloads and CSV rows fold into orders. A
+    # checkpoint taken under different ones (e.g. after changing ZP_STAGE_KEYS) no
+    # longer matches what a replay would build, so it is not resumed.
+    return CFG_LOWER, _STAGE_FLAGS
+
+
+def _orders_snapshot_state() -> tuple[int, dict[str, Any]] | None:
+    # Checkpoint of the aggregate with the journal position it covers, so a restart
+    # only replays events appended after it. Only shallow copies are taken here:
+    # bumping _SNAPSHOT_SEQ makes _sync_orders() copy an order before changing it,
+    # so the _OrderAgg objects captured stay as they are while they are pickled
+    # without LOCK. Callers hold LOCK, right after _sync_orders() has folded
+    # everything read.
+    global _ORDERS_UNSAVED, _SNAPSHOT_SEQ
+    _ORDERS_UNSAVED = 0
+    if _ORDERS is None or _ORDERS_SIG is None:
+        return None
+    _SNAPSHOT_SEQ += 1
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "seq": _SNAPSHOT_SEQ,
+        "fold_config": _fold_config(),
+        "bootstrap_sig": _ORDERS_SIG[0],
+        "inode": _LIVE_INODE,
+        "offset": _LIVE_OFFSET,
+        "last_received_at": _LAST_RECEIVED_AT,
+        "orders": dict(_ORDERS),
+        "counts": dict(_ORDERS_COUNTS),
+        "index": list(_ORDERS_INDEX),
     }
-    return {"summary": summary, "orders": rows}
+    return _SNAPSHOT_SEQ, state
+
+
+def _write_orders_snapshot(seq: int, state: dict[str, Any]) -> None:
+    # Best effort: on failure the next restart just replays more of the journal.
+    global _SNAPSHOT_WRITTEN
+    with _SNAPSHOT_WRITE_LOCK:
+        if seq <= _SNAPSHOT_WRITTEN:
+            return
+        tmp = SNAPSHOT_FILE.with_name(SNAPSHOT_FILE.name + ".tmp")
+        try:
+            with tmp.open("wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, SNAPSHOT_FILE)
+        except OSError:
+            return
+        _SNAPSHOT_WRITTEN = seq
+
+
+def _snapshot_writer() -> None:
+    while True:
+        snapshot = _SNAPSHOT_Q.get()
+        # Only the newest of several queued checkpoints is worth writing.
+        while True:
+            try:
+                snapshot = _SNAPSHOT_Q.get_nowait()
+            except queue.Empty:
+                break
+        _write_orders_snapshot(*snapshot)
+
+
+def _queue_orders_snapshot() -> None:
+    # Take a checkpoint and leave the writing to a background thread, so the request
+    # that crosses SNAPSHOT_EVERY does not hold LOCK while it is pickled. Callers hold LOCK.
+    global _SNAPSHOT_WRITER
+    snapshot = _orders_snapshot_state()
+    if snapshot is None:
+        return
+    if _SNAPSHOT_WRITER is None:
+        _SNAPSHOT_WRITER = threading.Thread(target=_snapshot_writer, name="orders-snapshot-writer", daemon=True)
+        _SNAPSHOT_WRITER.start()
+    _SNAPSHOT_Q.put(snapshot)
+
+
+def _save_orders_snapshot() -> None:
+    # Take a checkpoint and write it on this thread, e.g. at shutdown. Callers hold LOCK.
+    snapshot = _orders_snapshot_state()
+    if snapshot is not None:
+        _write_orders_snapshot(*snapshot)
+
+
+def load_orders_snapshot() -> bool:
+    # Resume the aggregate from SNAPSHOT_FILE if it still matches the bootstrap CSV,
+    # the journal it was taken from and _fold_config(). The file is written only by
+    # this server; pickle must never be pointed at untrusted input. Callers hold LOCK.
+    global _ORDERS, _ORDERS_SIG, _ORDERS_INDEX, _ORDERS_UNSAVED, _SNAPSHOT_SEQ, _SNAPSHOT_WRITTEN
+    global _LIVE_OFFSET, _LIVE_ENTRIES, _LAST_RECEIVED_AT, _LIVE_INODE
+    try:
+        with SNAPSHOT_FILE.open("rb") as f:
+            state = pickle.load(f)
+        st = os.stat(EVENTS_FILE)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return False
+    if not isinstance(state, dict) or state.get("version") != SNAPSHOT_VERSION:
+        return False
+    if state.get("fold_config") != _fold_config():
+        return False
+    bootstrap_sig, _ = _bootstrap_snapshot()
+    if state["bootstrap_sig"] != bootstrap_sig:
+        return False
+    if st.st_ino != state["inode"] or st.st_size < state["offset"]:
+        return False
+
+    _ORDERS = defaultdict(_OrderAgg, state["orders"])
+    # Every loaded order has a lower seq than the checkpoint it came from, and
+    # numbering carries on from there.
+    _SNAPSHOT_SEQ = _SNAPSHOT_WRITTEN = state["seq"]
+    _ORDERS_COUNTS.clear()
+    _ORDERS_COUNTS.update(state["counts"])
+    _ORDERS_INDEX = state["index"]
+    _ORDERS_SIG = (bootstrap_sig, _LIVE_GENERATION)
+    _ORDERS_UNSAVED = 0
+    _LIVE_ENTRIES = []
+    _LIVE_OFFSET = state["offset"]
+    _LIVE_INODE = state["inode"]
+    _LAST_RECEIVED_AT = state["last_received_at"]
+    return True
+
+
+def _cached_if_fresh(
+    cached: tuple[tuple[tuple[int, int] | None, int, int], bytes, str] | None,
+) -> tuple[bytes, str] | None:
+    # Lock-free GET fast path: the cached (body, ETag) if neither the CSV nor the
+    # journal has moved since it was built. Shared state is only ever rebound whole,
+    # so a racing update at worst makes this miss and the caller takes LOCK.
+    if cached is None:
+        return None
+    try:
+        csv_st = os.stat(BOOTSTRAP_CSV)
+    except FileNotFoundError:
+        return None
+    try:
+        live_st = os.stat(EVENTS_FILE)
+    except FileNotFoundError:
+        live_size, live_inode = 0, _LIVE_INODE
+    else:
+        live_size, live_inode = live_st.st_size, live_st.st_ino
+    key = ((csv_st.st_mtime_ns, csv_st.st_size), _LIVE_GENERATION, live_size)
+    if key != cached[0] or live_inode != _LIVE_INODE:
+        return None
+    return cached[1], cached[2]
+
+
+def orders_json() -> tuple[bytes, str]:
+    # Serialized /api/orders body and its ETag, rebuilt only when the CSV or the
+    # journal has changed since it was last built. Callers hold LOCK.
+    global _ORDERS_JSON
+    # Fold first: a CSV change re-reads the journal, which moves the key below.
+    orders = _sync_orders()
+    key = (_ORDERS_SIG[0], _LIVE_GENERATION, _LIVE_OFFSET)
+    if _ORDERS_JSON is None or _ORDERS_JSON[0] != key:
+        data = _summarize_orders(orders, _ORDERS_INDEX)
+        data["meta"] = {
+            "last_live_event_at": last_live_event_received_at(),
+            "bootstrap_csv": str(BOOTSTRAP_CSV),
+        }
+        body = _json_dumps(data)
+        _ORDERS_JSON = (key, body, _etag(body))
+    return _ORDERS_JSON[1], _ORDERS_JSON[2]
+
+
+def _query_param(query: str, name: str) -> str:
+    # First non-blank `name` value in a query string, decoded as parse_qs() would.
+    for field in query.split("&"):
+        key, sep, value = field.partition("=")
+        if sep and value and unquote_plus(key) == name:
+            return unquote_plus(value)
+    return ""
+
+
+class BodyTooLarge(ValueError):
+    pass
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
 
 
 def parse_post_body(handler: SimpleHTTPRequestHandler) -> dict[str, Any]:
     length = int(handler.headers.get("Content-Length", "0"))
+    # Refuse before reading, so an oversized body never reaches memory or the parser.
+    if length > CFG["max_body"]:
+        raise BodyTooLarge("body too large")
     body = handler.rfile.read(length) if length > 0 else b""
     ctype = (handler.headers.get("Content-Type") or "").lower()
 
     if "application/json" in ctype:
         if not body:
             return {}
-        data = json.loads(body.decode("utf-8"))
+        data = _json_loads(body)
         if isinstance(data, dict):
             return data
         return {"items": data}
@@ -338,27 +1075,47 @@ class Handler(SimpleHTTPRequestHandler):
         super().__init__(*args, directory=str(ROOT), **kwargs)
 
     def _write_json(self, status: int, payload: dict[str, Any]) -> None:
-        b = json.dumps(payload).encode("utf-8")
+        self._write_json_bytes(status, _json_dumps(payload))
+
+    def _write_json_bytes(self, status: int, b: bytes) -> None:
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(b)))
         self.end_headers()
         self.wfile.write(b)
 
-    def _auth_ok(self) -> bool:
+    def _write_cached_json(self, body: bytes, etag: str) -> None:
+        # Clients revalidating a body they already hold get an empty 304 instead.
+        tags = {t.strip().removeprefix("W/") for t in self.headers.get("If-None-Match", "").split(",")}
+        if etag in tags or "*" in tags:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _auth_ok(self, query: str) -> bool:
+        # `query` is the part of self.path after "?", already split off by the caller.
         expected = CFG["webhook_secret"]
         if not expected:
             return True
-        parsed = urlparse(self.path)
-        qs = parse_qs(parsed.query)
-        q_secret = (qs.get("secret") or [""])[0]
-        h_secret = self.headers.get("X-Zoho-Webhook-Secret", "")
-        bearer = self.headers.get("Authorization", "")
-        return expected in (q_secret, h_secret, bearer.replace("Bearer ", ""))
+        secret = expected.encode()
+        candidates = (
+            _query_param(query, "secret") if query else "",
+            self.headers.get("X-Zoho-Webhook-Secret", ""),
+            self.headers.get("Authorization", "").replace("Bearer ", ""),
+        )
+        return any(hmac.compare_digest(secret, c.encode()) for c in candidates)
 
     def do_GET(self) -> None:  # noqa: N802
-        parsed = urlparse(self.path)
-        if parsed.path == "/api/health":
+        path = self.path.partition("?")[0]
+        if path == "/api/health":
             self._write_json(
                 HTTPStatus.OK,
                 {
@@ -368,53 +1125,98 @@ class Handler(SimpleHTTPRequestHandler):
                 },
             )
             return
-        if parsed.path == "/api/orders":
+        if path == "/api/orders":
+            cached = _cached_if_fresh(_ORDERS_JSON)
+            if cached is None:
+                with LOCK:
+                    cached = orders_json()
+            self._write_cached_json(*cached)
+            return
+        if path == "/api/orders/summary":
             with LOCK:
-                data = classify(load_bootstrap_entries() + load_live_entries())
-                data["meta"] = {
-                    "last_live_event_at": last_live_event_received_at(),
-                    "bootstrap_csv": str(BOOTSTRAP_CSV),
-                }
-            self._write_json(HTTPStatus.OK, data)
+                summary = orders_summary()
+            self._write_json(
+                HTTPStatus.OK, {"summary": summary, "last_live_event_at": last_live_event_received_at()}
+            )
             return
         return super().do_GET()
 
     def do_POST(self) -> None:  # noqa: N802
-        parsed = urlparse(self.path)
-        if parsed.path != "/api/zoho/webhook":
+        path, _, query = self.path.partition("?")
+        if path != "/api/zoho/webhook":
             self._write_json(HTTPStatus.NOT_FOUND, {"error": "not_found"})
             return
-        if not self._auth_ok():
+        if not self._auth_ok(query):
             self._write_json(HTTPStatus.UNAUTHORIZED, {"error": "unauthorized"})
             return
 
         try:
             payload = parse_post_body(self)
+        except BodyTooLarge as exc:
+            self._write_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "payload_too_large", "detail": str(exc)}
+            )
+            return
         except Exception as exc:  # pragma: no cover
             self._write_json(HTTPStatus.BAD_REQUEST, {"error": "invalid_payload", "detail": str(exc)})
             return
 
+        items = split_batch(payload)
+        if items == []:
+            self._write_json(HTTPStatus.BAD_REQUEST, {"error": "invalid_payload", "detail": "empty batch"})
+            return
+        payloads = items if items is not None else [payload]
+        entries = [normalize_payload(p) for p in payloads]
+        if CFG["async_ingest"]:
+            # Only queued so far; the summary is at /api/orders/summary once written.
+            append_live_events(payloads, entries, wait=False)
+            self._write_json(HTTPStatus.ACCEPTED, {"ok": True, "accepted": len(entries)})
+            return
+        append_live_events(payloads, entries)
         with LOCK:
-            append_live_event(payload)
-            data = classify(load_bootstrap_entries() + load_live_entries())
+            summary = orders_summary()
 
-        self._write_json(
-            HTTPStatus.OK,
-            {
-                "ok": True,
-                "received_ref_number": normalize_payload(payload).ref_number,
-                "summary": data["summary"],
-            },
-        )
+        result: dict[str, Any] = {
+            "ok": True,
+            "received_ref_number": entries[-1].ref_number,
+        }
+        if items is not None:
+            result["received_ref_numbers"] = [e.ref_number for e in entries]
+        result["summary"] = summary
+        self._write_json(HTTPStatus.OK, result)
+
+
+class _Server(ThreadingHTTPServer):
+    # socketserver's default listen backlog of 5 makes the kernel reset
+    # connections during webhook bursts or many dashboards loading at once.
+    request_queue_size = 128
 
 
 def main() -> None:
-    server = ThreadingHTTPServer((CFG["host"], CFG["port"]), Handler)
+    server = _Server((CFG["host"], CFG["port"]), Handler)
     print(f"Serving dashboard on http://{CFG['host']}:{CFG['port']}/dashboard/index.html")
     print("Webhook endpoint:", f"http://{CFG['host']}:{CFG['port']}/api/zoho/webhook")
     if CFG["webhook_secret"]:
         print("Webhook secret enabled.")
-    server.serve_forever()
+    with LOCK:
+        if load_orders_snapshot():
+            print("Resumed orders from", SNAPSHOT_FILE)
+        _sync_orders()
+
+    def _stop(signum: int, frame: Any) -> None:
+        # Hosts stop the service with SIGTERM; leave serve_forever() as Ctrl+C does,
+        # so the queued writes and the final checkpoint below still happen.
+        # shutdown() waits for serve_forever() to return, so it needs its own thread.
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    finally:
+        _drain_writes()
+        with LOCK:
+            _sync_orders()
+            _save_orders_snapshot()
 
 
 if __name__ == "__main__":